@@ -1,15 +1,32 @@
 import logging
 import sqlite3
 import threading
+import time
 import os
 import configparser # For saving/loading settings
+import hashlib
+import itertools
+import json
+import operator
+import queue
+import random
+import re
+import string
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from io import BytesIO
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Deque, Callable, Tuple, Iterator, Set
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor as APSThreadPoolExecutor
 from apscheduler.schedulers.base import STATE_RUNNING # For checking scheduler state
 
 import tkinter as tk
@@ -17,6 +34,7 @@ from tkinter import ttk, scrolledtext, messagebox
 from PIL import Image, ImageTk
 
 import gspread
+from gspread.utils import absolute_range_name
 from ttkthemes import ThemedTk
 
 # --- Application Constants ---
@@ -40,30 +58,101 @@ DEFAULT_SETTINGS = {
 PETANGO_URL = (
     'https://ws.petango.com/webservices/adoptablesearch/wsAdoptableAnimals2.aspx'
     '?species=All&gender=A&agegroup=All&location=&site=&onhold=A&orderby=Name'
-    '&colnum=4&css=&authkey=40fm1dbi1t4267edhjlafrfmbgfqfvmi0vjjm3iori7pxqk8xp'
-    '&recAmount=&detailsInPopup=Yes&featuredPet=Include&stageID='
+    '&colnum=1&css=&authkey=40fm1dbi1t4267edhjlafrfmbgfqfvmi0vjjm3iori7pxqk8xp'
+    '&recAmount=&detailsInPopup=No&featuredPet=Include&stageID='
 )
+FETCH_MAX_ATTEMPTS = 3 # Only transient failures (timeouts, dropped connections, 5xx/429) are retried
+
+# --- HTTP Session (pooled keep-alive connections for the Petango fetch) ---
+# No adapter-level retries: sync_database's FETCH_MAX_ATTEMPTS loop is the only retry layer,
+# so a hung or failing endpoint costs at most FETCH_MAX_ATTEMPTS requests.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+# Advertise every encoding urllib3 can decode here (gzip/deflate, plus br/zstd when installed).
+SESSION.headers.update(make_headers(accept_encoding=True))
+
+# Pet photos come from a separate image host; a dedicated pool keeps photo clicks from queuing behind a sync fetch.
+PHOTO_SESSION = requests.Session()
+_photo_adapter = HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+)
+PHOTO_SESSION.mount('https://', _photo_adapter); PHOTO_SESSION.mount('http://', _photo_adapter)
+
+# --- Petango Markup (XPaths are compiled once and evaluated per list item) ---
+def _has_class(class_name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+_INFO_BLOCK = f"div[{_has_class('list-animal-info-block')}]"
+_SPECIES_LABEL = f".//{_INFO_BLOCK}//div[contains(text(), 'Species:')]"
+PETANGO_INFO_XPATH = etree.XPath(f".//{_INFO_BLOCK}")
+PETANGO_FIELD_XPATHS = {
+    field: etree.XPath(f"string(.//{_INFO_BLOCK}//div[{_has_class(class_name)}])")
+    for field, class_name in (
+        ('id', 'list-animal-id'), ('name', 'list-animal-name'), ('species', 'list-anima-species'),
+        ('breed', 'list-animal-breed'), ('sexSN', 'list-animal-sexSN'), ('age', 'list-animal-age'),
+        ('location', 'hidden'), ('detail_id', 'list-animal-detail'),
+    )
+}
+PETANGO_SPECIES_SIBLING_XPATH = etree.XPath(f"string({_SPECIES_LABEL}/following-sibling::div[1])")
+PETANGO_SPECIES_ROW_XPATH = etree.XPath(
+    f"string({_SPECIES_LABEL}/ancestor::div[{_has_class('list-animal-row')}][1]//div[{_has_class('list-animal-value')}])"
+)
+PETANGO_PHOTO_XPATH = etree.XPath(f".//div[{_has_class('list-animal-photo-block')}]//img/@src")
 
 # --- Local Database Configuration ---
 DB_PATH = os.path.join(SCRIPT_DIR, 'pets_enhanced.db')
+# Applied to every connection; journal_mode=WAL is persistent and only set in init_db.
+SQLITE_CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-32000',
+)
+SQLITE_CACHED_STATEMENTS = 256
+_db_local = threading.local()
+_db_connections: List[sqlite3.Connection] = [] # Every per-thread connection, so shutdown can close them
+_db_connections_lock = threading.Lock()
 
 # --- Google Sheets Configuration ---
 GOOGLE_CREDENTIALS_FILE = os.path.join(SCRIPT_DIR, 'sacred-sol-346504-70a7b5193a92.json')
 GOOGLE_SHEET_ID = '1jO9GowDUU6GzSHA39zbR7beK3GgW9bAsY71LIftdCyM'
 GOOGLE_SHEET_FALLBACK_NAME = 'Pets'
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive.file']
+GSHEET_MAX_ATTEMPTS = 5 # Quota (429) and 5xx API errors are retried with exponential backoff
+GSHEET_BACKOFF_MAX_SECONDS = 60
+GSHEET_MIN_MANUAL_INTERVAL_SECONDS = 30 # Manual pushes this soon after the previous push are refused
+
+# --- Shutdown ---
+# Set when the window closes. Workers check it between phases and wait on it instead of sleeping
+# through retry backoff, so a sync in flight stops within one request timeout rather than minutes.
+_shutdown_event = threading.Event()
+
+# --- GUI Configuration ---
+UI_QUEUE_POLL_MS = 50 # How often the Tk main thread applies results posted by worker threads
+THUMBNAIL_DIR = os.path.join(SCRIPT_DIR, 'thumbs') # Downsized pet photos, keyed by a hash of the photo URL
+THUMBNAIL_SIZE = (250, 250)
+PHOTO_CACHE_MAX_ENTRIES = 64 # Decoded PhotoImages kept in memory, most recently viewed last
 
 # --- Logging Configuration ---
-LOG_BUFFER_MAX_LINES = 500
+LOG_BUFFER_MAX_LINES = 10000
 
 # --- Logging Setup ---
-log_buffer: List[str] = []
+log_buffer: Deque[str] = deque(maxlen=LOG_BUFFER_MAX_LINES) # Oldest lines drop off automatically
 class TkLogHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines_emitted = 0 # Monotonic; log_buffer holds the newest of these lines
+
     def emit(self, record: logging.LogRecord):
-        log_entry = self.format(record)
-        log_buffer.append(log_entry)
-        if len(log_buffer) > LOG_BUFFER_MAX_LINES:
-            log_buffer.pop(0)
+        log_buffer.append(self.format(record))
+        self.lines_emitted += 1
+
+    def lines_since(self, seen: int) -> Tuple[List[str], int]:
+        # Lines emitted after the first `seen` (as far as log_buffer still holds them), plus the new high-water mark.
+        with self.lock:
+            new_count = min(self.lines_emitted - seen, len(log_buffer))
+            return list(itertools.islice(log_buffer, len(log_buffer) - new_count, None)), self.lines_emitted
 
 tk_log_handler = TkLogHandler()
 tk_log_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', '%Y-%m-%d %H:%M:%S'))
@@ -108,21 +197,86 @@ def save_config(config: configparser.ConfigParser):
         logger.error(f"Error saving config file {CONFIG_FILE_PATH}: {e}", exc_info=True)
 
 # --- Database Initialization ---
+def connect_db() -> sqlite3.Connection:
+    # Autocommit mode: callers that write open their own transaction with BEGIN.
+    conn = sqlite3.connect(DB_PATH, isolation_level=None, check_same_thread=False,
+                           cached_statements=SQLITE_CACHED_STATEMENTS)
+    for pragma in SQLITE_CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def get_conn() -> sqlite3.Connection:
+    # One long-lived connection per thread (GUI and sync worker) so the sqlite3
+    # statement cache survives between calls instead of being rebuilt per query.
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None:
+        conn = _db_local.conn = connect_db()
+        with _db_connections_lock: _db_connections.append(conn)
+    return conn
+
+def close_db_connections():
+    # Shutdown only: callers must make sure no other thread is still mid-query.
+    with _db_connections_lock:
+        conns = _db_connections[:]; _db_connections.clear()
+    for conn in conns:
+        try: conn.close()
+        except sqlite3.Error as e: logger.warning("Error closing database connection: %s", e)
+
 def init_db():
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_conn() as conn:
             cursor = conn.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
             cursor.execute(
                 '''
                 CREATE TABLE IF NOT EXISTS pets (
-                    id TEXT PRIMARY KEY, name TEXT, species TEXT, breed TEXT,
-                    sexSN TEXT, age TEXT, location TEXT, detail_id TEXT,
-                    photo_url TEXT, last_seen TIMESTAMP, archived INTEGER DEFAULT 0
+                    id TEXT PRIMARY KEY, name TEXT COLLATE NOCASE, species TEXT COLLATE NOCASE,
+                    breed TEXT COLLATE NOCASE, sexSN TEXT COLLATE NOCASE, age TEXT, location TEXT,
+                    detail_id TEXT, photo_url TEXT, last_seen TIMESTAMP, archived INTEGER DEFAULT 0
                 )
                 '''
             )
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_last_seen ON pets(last_seen)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_archived_name ON pets(archived, name)")
+            # The list view reads every displayed column in (archived, name) order; covering them
+            # lets SQLite answer it from the index alone. It supersedes the old idx_archived_name.
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_arch_name_cover ON pets("
+                "archived, name, id, species, breed, sexSN, age, location, detail_id, photo_url)"
+            )
+            cursor.execute("DROP INDEX IF EXISTS idx_archived_name")
+            cursor.execute("DROP INDEX IF EXISTS idx_species_lower")
+            cursor.execute("DROP INDEX IF EXISTS idx_sexsn_lower")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_species_nocase ON pets(species COLLATE NOCASE)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sexsn_nocase ON pets(sexSN COLLATE NOCASE)")
+            # Full-text index for the search box. The trigram tokenizer matches arbitrary
+            # substrings, like the LIKE '%term%' search it replaces.
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pets_fts'")
+            fts_exists = cursor.fetchone() is not None
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS pets_fts USING fts5("
+                "name, breed, species, content='pets', content_rowid='rowid', tokenize='trigram')"
+            )
+            cursor.executescript(
+                '''
+                CREATE TRIGGER IF NOT EXISTS pets_fts_ai AFTER INSERT ON pets BEGIN
+                    INSERT INTO pets_fts (rowid, name, breed, species) VALUES (new.rowid, new.name, new.breed, new.species);
+                END;
+                CREATE TRIGGER IF NOT EXISTS pets_fts_ad AFTER DELETE ON pets BEGIN
+                    INSERT INTO pets_fts (pets_fts, rowid, name, breed, species) VALUES ('delete', old.rowid, old.name, old.breed, old.species);
+                END;
+                CREATE TRIGGER IF NOT EXISTS pets_fts_au AFTER UPDATE OF name, breed, species ON pets
+                WHEN old.name IS NOT new.name OR old.breed IS NOT new.breed OR old.species IS NOT new.species BEGIN
+                    INSERT INTO pets_fts (pets_fts, rowid, name, breed, species) VALUES ('delete', old.rowid, old.name, old.breed, old.species);
+                    INSERT INTO pets_fts (rowid, name, breed, species) VALUES (new.rowid, new.name, new.breed, new.species);
+                END;
+                '''
+            )
+            if not fts_exists:
+                cursor.execute("INSERT INTO pets_fts (pets_fts) VALUES ('rebuild')")
+            # Hash of each row last written to the Google Sheet (row 1 is the header), so syncs only send changed rows.
+            cursor.execute("CREATE TABLE IF NOT EXISTS gsheet_rows (row_num INTEGER PRIMARY KEY, row_hash TEXT NOT NULL)")
+            # Hash of the whole payload last written, so an unchanged update skips the Sheets API entirely.
+            cursor.execute("CREATE TABLE IF NOT EXISTS gsheet_state (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
             conn.commit()
         logger.info('Successfully initialized database at %s', DB_PATH)
     except sqlite3.Error as e:
@@ -130,194 +284,430 @@ def init_db():
         raise
 
 # --- Fetch & Parse Petango Data ---
-def fetch_animals() -> List[Dict[str, Any]]:
+def _xpath_text(xpath: etree.XPath, element) -> Optional[str]:
+    return xpath(element).strip() or None
+
+def _element_html(element) -> str:
+    return lxml.html.tostring(element, pretty_print=True, encoding='unicode')
+
+class _LazyStr:
+    # Defers building an expensive log argument until a handler actually formats the record.
+    __slots__ = ('_build',)
+    def __init__(self, build: Callable[[], str]):
+        self._build = build
+    def __str__(self) -> str:
+        return self._build()
+
+# Species/breed/sex/age/location repeat across most pets; share one str object per distinct value.
+_INTERN: Dict[str, str] = {}
+def _intern(value: Optional[str]) -> Optional[str]:
+    return _INTERN.setdefault(value, value) if value else value
+
+@dataclass
+class FetchResult:
+    animals: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None # Set when the page could not be fetched at all
+    transient_error: bool = False # The failure is worth retrying (timeout, connection drop, 5xx/429)
+
+class ShutdownRequested(Exception):
+    pass
+
+def _raise_if_shutting_down():
+    if _shutdown_event.is_set(): raise ShutdownRequested("Application is shutting down.")
+
+def _backoff_sleep(delay: float):
+    # Returns after `delay` seconds, or raises ShutdownRequested as soon as the app starts closing.
+    if _shutdown_event.wait(delay): raise ShutdownRequested("Application is shutting down.")
+
+def _iter_list_items(content: bytes) -> Iterator[etree._Element]:
+    # Streams the page and yields each div.list-item as soon as its end tag is parsed. Items that
+    # were already handed out are cleared and detached, so only the current one is kept in memory.
+    for _event, elem in etree.iterparse(BytesIO(content), events=('end',), tag='div', html=True):
+        if 'list-item' not in (elem.get('class') or '').split():
+            continue
+        yield elem
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+def fetch_animals() -> FetchResult:
     logger.info('Fetching pet data from Petango...')
     animals: List[Dict[str, Any]] = []
     try:
-        resp = requests.get(PETANGO_URL, timeout=30)
+        resp = SESSION.get(PETANGO_URL, timeout=(5, 30))
         resp.raise_for_status()
     except requests.exceptions.Timeout:
         logger.error('Failed to fetch data from Petango: Request timed out.')
-        return animals
+        return FetchResult(error='Request timed out.', transient_error=True)
+    except requests.exceptions.HTTPError as e:
+        logger.error('Failed to fetch data from Petango: %s', e)
+        status = e.response.status_code if e.response is not None else 0
+        return FetchResult(error=str(e), transient_error=status >= 500 or status == 429)
+    except requests.exceptions.ConnectionError as e:
+        logger.error('Failed to fetch data from Petango: %s', e)
+        return FetchResult(error=str(e), transient_error=True)
     except requests.exceptions.RequestException as e:
         logger.error('Failed to fetch data from Petango: %s', e)
-        return animals
-    soup = BeautifulSoup(resp.text, 'html.parser')
-    for item_idx, item in enumerate(soup.find_all('div', class_='list-item')):
-        try:
-            info = item.find('div', class_='list-animal-info-block')
-            photo_block = item.find('div', class_='list-animal-photo-block')
+        return FetchResult(error=str(e))
+    logger.debug('Received %d bytes of HTML from Petango (Content-Encoding: %s).',
+                 len(resp.content), resp.headers.get('Content-Encoding', 'identity'))
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if not resp.content.strip():
+        logger.error('Petango returned an empty page.')
+        return FetchResult(error='Petango returned an empty page.', transient_error=True)
+    try:
+        for item_idx, item in enumerate(_iter_list_items(resp.content)):
+            try:
+                pet_id = _xpath_text(PETANGO_FIELD_XPATHS['id'], item)
+                if not pet_id:
+                    logger.warning("Skipping item %d due to missing Pet ID.", item_idx+1)
+                    continue
+            
+                if item_idx < 3 and debug_enabled: 
+                     info = PETANGO_INFO_XPATH(item)
+                     logger.debug("Item %d, Pet ID %s: Raw info block HTML: %s", item_idx+1, pet_id, _LazyStr(lambda: _element_html(info[0]) if info else 'N/A'))
 
-            def get_text_from_class(element, class_name):
-                found = element.find('div', class_=class_name) if element else None
-                return found.text.strip() if found and found.text else None
+                parsed_species = _xpath_text(PETANGO_FIELD_XPATHS['species'], item)
+                if debug_enabled: 
+                    logger.debug("Item %d, Pet ID %s: Attempt 1 (class 'list-anima-species') - Parsed species: '%s'", item_idx+1, pet_id, parsed_species)
 
-            pet_id = get_text_from_class(info, 'list-animal-id')
-            if not pet_id:
-                logger.warning(f"Skipping item {item_idx+1} due to missing Pet ID.")
-                continue
-            
-            if item_idx < 3 and logger.isEnabledFor(logging.DEBUG): 
-                 logger.debug(f"Item {item_idx+1}, Pet ID {pet_id}: Raw info block HTML: {info.prettify() if info else 'N/A'}")
-
-            parsed_species = get_text_from_class(info, 'list-anima-species') 
-            if logger.isEnabledFor(logging.DEBUG): 
-                logger.debug(f"Item {item_idx+1}, Pet ID {pet_id}: Attempt 1 (class 'list-anima-species') - Parsed species: '{parsed_species}'")
-
-            if not parsed_species and info:
-                logger.debug(f"Item {item_idx+1}, Pet ID {pet_id}: Species not found with specific class 'list-anima-species'. Trying alternative label search.")
-                species_label_tag = info.find(lambda tag: tag.name == 'div' and "Species:" in tag.get_text(strip=True))
-                if species_label_tag:
-                    logger.debug(f"Item {item_idx+1}, Pet ID {pet_id}: Found label tag: {species_label_tag.prettify()[:100]}")
-                    value_tag = species_label_tag.find_next_sibling('div')
-                    if value_tag:
-                        parsed_species = value_tag.get_text(strip=True)
-                        logger.debug(f"Item {item_idx+1}, Pet ID {pet_id}: Attempt 2 (next sibling) - Parsed species: '{parsed_species}'")
-                    else: 
-                        parent_row = species_label_tag.find_parent(class_='list-animal-row') 
-                        if parent_row:
-                             value_in_row = parent_row.find('div', class_='list-animal-value')
-                             if value_in_row:
-                                 parsed_species = value_in_row.get_text(strip=True)
-                                 logger.debug(f"Item {item_idx+1}, Pet ID {pet_id}: Attempt 2b (value in row) - Parsed species: '{parsed_species}'")
-                else:
-                    logger.debug(f"Item {item_idx+1}, Pet ID {pet_id}: Could not find 'Species:' label for alternative parsing.")
+                if not parsed_species:
+                    logger.debug("Item %d, Pet ID %s: Species not found with specific class 'list-anima-species'. Trying alternative label search.", item_idx+1, pet_id)
+                    parsed_species = _xpath_text(PETANGO_SPECIES_SIBLING_XPATH, item)
+                    if parsed_species:
+                        logger.debug("Item %d, Pet ID %s: Attempt 2 (next sibling) - Parsed species: '%s'", item_idx+1, pet_id, parsed_species)
+                    else:
+                        parsed_species = _xpath_text(PETANGO_SPECIES_ROW_XPATH, item)
+                        if parsed_species:
+                            logger.debug("Item %d, Pet ID %s: Attempt 2b (value in row) - Parsed species: '%s'", item_idx+1, pet_id, parsed_species)
+                        else:
+                            logger.debug("Item %d, Pet ID %s: Could not find 'Species:' label for alternative parsing.", item_idx+1, pet_id)
             
-            if not parsed_species:
-                 logger.warning(f"Item {item_idx+1}, Pet ID {pet_id}: Species could not be parsed. Will be stored as None/empty.")
-
-
-            animal = {
-                'id': pet_id, 'name': get_text_from_class(info, 'list-animal-name'),
-                'species': parsed_species, 
-                'breed': get_text_from_class(info, 'list-animal-breed'),
-                'sexSN': get_text_from_class(info, 'list-animal-sexSN'),
-                'age': get_text_from_class(info, 'list-animal-age'),
-                'location': get_text_from_class(info, 'hidden'), 
-                'detail_id': get_text_from_class(info, 'list-animal-detail'), 'photo_url': None
-            }
-            photo_img = photo_block.find('img') if photo_block else None
-            if photo_img and photo_img.get('src'):
-                animal['photo_url'] = photo_img['src']
-            animals.append(animal)
-        except Exception as e:
-            logger.error(f"Error parsing individual animal item {item_idx+1}: %s. Item content: %s", e, item.prettify()[:200], exc_info=True)
+                if not parsed_species:
+                     logger.warning("Item %d, Pet ID %s: Species could not be parsed. Will be stored as None/empty.", item_idx+1, pet_id)
+
+                photo_src = PETANGO_PHOTO_XPATH(item)
+                animal = {
+                    'id': pet_id, 'name': _xpath_text(PETANGO_FIELD_XPATHS['name'], item),
+                    'species': _intern(parsed_species), 
+                    'breed': _intern(_xpath_text(PETANGO_FIELD_XPATHS['breed'], item)),
+                    'sexSN': _intern(_xpath_text(PETANGO_FIELD_XPATHS['sexSN'], item)),
+                    'age': _intern(_xpath_text(PETANGO_FIELD_XPATHS['age'], item)),
+                    'location': _intern(_xpath_text(PETANGO_FIELD_XPATHS['location'], item)), 
+                    'detail_id': _xpath_text(PETANGO_FIELD_XPATHS['detail_id'], item),
+                    'photo_url': photo_src[0] if photo_src else None
+                }
+                animals.append(animal)
+            except Exception as e:
+                logger.error("Error parsing individual animal item %d: %s. Item content: %s", item_idx+1, e,
+                             _LazyStr(lambda: _element_html(item)[:200]), exc_info=True)
+    except etree.XMLSyntaxError as e:
+        # iterparse recovers from broken markup, but still raises when it finds no document at all.
+        logger.error('Failed to parse Petango page: %s', e)
+        return FetchResult(error=f'Could not parse Petango page: {e}', transient_error=True)
     logger.info('Parsed %d animals from Petango.', len(animals))
-    return animals
+    return FetchResult(animals=animals)
 
 # --- Synchronization Logic (Local DB) ---
-def sync_database():
+def sync_database() -> int:
+    # Returns how many animals Petango listed; 0 means the page was empty and the DB was left untouched.
     sync_time = datetime.now(timezone.utc)
-    animals_fetched = fetch_animals()
-    if not animals_fetched:
-        logger.warning("No animals fetched from Petango (first attempt). Retrying once.")
-        animals_fetched = fetch_animals()
+    result = fetch_animals()
+    attempt = 1
+    while result.transient_error and attempt < FETCH_MAX_ATTEMPTS:
+        delay = min(2 ** attempt, 8)
+        logger.warning("Transient error fetching from Petango (attempt %d of %d). Retrying in %ds.",
+                       attempt, FETCH_MAX_ATTEMPTS, delay)
+        _backoff_sleep(delay)
+        result = fetch_animals()
+        attempt += 1
+    if result.error:
+        logger.error("Failed to fetch animal data from Petango after %d attempt(s). Skipping database sync.", attempt)
+        raise ConnectionError(f"Failed to fetch animal data from Petango: {result.error}")
+    animals_fetched = result.animals
     if not animals_fetched:
-        logger.error("Failed to fetch animal data from Petango after retry. Skipping database sync.")
-        raise ConnectionError("Failed to fetch animal data from Petango after retry.")
-    updated_count = 0; inserted_count = 0
+        logger.warning("Petango returned no animals. Skipping database sync so existing pets are not archived.")
+        return 0
+    conn = get_conn()
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            active_ids = {a['id'] for a in animals_fetched if a.get('id')}
-            for a in animals_fetched:
-                if not a.get('id'): continue
-                cursor.execute("SELECT id FROM pets WHERE id = ?", (a['id'],))
-                exists = cursor.fetchone()
-                pet_details = (
-                    a.get('name'), a.get('species'), a.get('breed'), a.get('sexSN'), a.get('age'),
-                    a.get('location'), a.get('detail_id'), a.get('photo_url'), sync_time
-                )
-                if exists:
-                    cursor.execute(
-                        '''UPDATE pets SET name = ?, species = ?, breed = ?, sexSN = ?, age = ?,
-                           location = ?, detail_id = ?, photo_url = ?, last_seen = ?, archived = 0
-                           WHERE id = ?''',
-                        (*pet_details, a['id']))
-                    if cursor.rowcount > 0: updated_count +=1
-                else:
-                    cursor.execute(
-                        '''INSERT INTO pets (id, name, species, breed, sexSN, age, location,
-                           detail_id, photo_url, last_seen, archived)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)''',
-                        (a['id'], *pet_details))
-                    if cursor.rowcount > 0: inserted_count +=1
-            archived_count = 0
-            if active_ids: 
-                placeholders = ', '.join('?' for _ in active_ids)
-                archive_sql = f"UPDATE pets SET archived = 1, last_seen = ? WHERE id NOT IN ({placeholders}) AND archived = 0"
-                archived_pets_params = [sync_time] + list(active_ids)
-                cursor.execute(archive_sql, archived_pets_params)
-                archived_count = cursor.rowcount
-            else:
-                logger.warning("Skipping archival step as no active animal IDs were processed from fetch (animals_fetched was empty).")
-            conn.commit()
-            logger.info('Local DB sync complete. Inserted: %d, Updated: %d, Archived: %d.',
-                        inserted_count, updated_count, archived_count)
-    except sqlite3.Error as e: logger.error('Database error during local sync: %s', e, exc_info=True); raise
+        cursor = conn.cursor()
+        cursor.execute('BEGIN')
+        active_ids = []
+        rows = []
+        for a in animals_fetched:
+            pet_id = a.get('id')
+            if not pet_id: continue
+            active_ids.append(pet_id)
+            rows.append((pet_id, a.get('name'), a.get('species'), a.get('breed'), a.get('sexSN'), a.get('age'),
+                         a.get('location'), a.get('detail_id'), a.get('photo_url'), sync_time))
+        cursor.execute("SELECT COUNT(*) FROM pets")
+        count_before = cursor.fetchone()[0]
+        cursor.executemany(
+            '''INSERT INTO pets (id, name, species, breed, sexSN, age, location,
+               detail_id, photo_url, last_seen, archived)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+               ON CONFLICT(id) DO UPDATE SET name = excluded.name, species = excluded.species,
+               breed = excluded.breed, sexSN = excluded.sexSN, age = excluded.age,
+               location = excluded.location, detail_id = excluded.detail_id,
+               photo_url = excluded.photo_url, last_seen = excluded.last_seen, archived = 0''',
+            rows)
+        cursor.execute("SELECT COUNT(*) FROM pets")
+        inserted_count = cursor.fetchone()[0] - count_before
+        updated_count = len(rows) - inserted_count
+        archived_count = 0
+        if active_ids: 
+            # The active set is bound as one JSON array so the statement text never depends on its size.
+            cursor.execute(
+                "UPDATE pets SET archived = 1, last_seen = ? WHERE archived = 0 AND id NOT IN (SELECT value FROM json_each(?))",
+                (sync_time, json.dumps(active_ids)))
+            archived_count = cursor.rowcount
+        else:
+            logger.warning("Skipping archival step as no active animal IDs were processed from fetch (animals_fetched was empty).")
+        cursor.execute('COMMIT')
+        logger.info('Local DB sync complete. Inserted: %d, Updated: %d, Archived: %d.',
+                    inserted_count, updated_count, archived_count)
+        return len(rows)
+    except sqlite3.Error as e: conn.rollback(); logger.error('Database error during local sync: %s', e, exc_info=True); raise
     except ConnectionError: raise
-    except Exception as e: logger.error('Unexpected error during local sync: %s', e, exc_info=True); raise
+    except Exception as e: conn.rollback(); logger.error('Unexpected error during local sync: %s', e, exc_info=True); raise
 
 # --- Filtered Data Fetching ---
+PET_COLUMNS = ('id', 'name', 'species', 'breed', 'sexSN', 'age', 'location', 'detail_id', 'photo_url', 'archived')
+ARCHIVED_FILTER_VALUES = {"Active": 0, "Archived": 1}
+# The trigram tokenizer cannot look up terms shorter than three characters; those fall back to LIKE.
+FTS_MIN_SEARCH_LENGTH = 3
+# A single SQL text for every filter combination (unused filters are bound as NULL),
+# so the connection's statement cache always hits the same prepared statement.
+FILTERED_PETS_WHERE = """
+    WHERE (:search IS NULL OR id LIKE :search
+           OR rowid IN (SELECT rowid FROM pets_fts WHERE :search_fts IS NOT NULL AND pets_fts MATCH :search_fts)
+           OR (:search_fts IS NULL AND (name LIKE :search OR species LIKE :search OR breed LIKE :search)))
+      AND (:species IS NULL OR species = :species COLLATE NOCASE)
+      AND (:sex IS NULL OR sexSN = :sex COLLATE NOCASE)
+      AND (:archived IS NULL OR archived = :archived)
+"""
+FILTERED_PETS_SQL = f"SELECT {', '.join(PET_COLUMNS)} FROM pets {FILTERED_PETS_WHERE}"
+COUNT_FILTERED_PETS_SQL = f"SELECT COUNT(*) FROM pets {FILTERED_PETS_WHERE}"
+PET_DEFAULT_ORDER_BY = "archived ASC, name ASC"
+# ORDER BY terms for the sortable table columns, each followed by the sort direction: NULLs first, then
+# all-digit values by number, then the rest case-insensitively. pet_sort_key is the same order in Python.
+_SQL_IS_DIGITS = "({col} GLOB '[0-9]*' AND NOT {col} GLOB '*[^0-9]*')"
+PET_SORT_ORDER_BY = {
+    col: (f"{col} IS NOT NULL", f"NOT {_SQL_IS_DIGITS.format(col=col)}",
+          f"CASE WHEN {_SQL_IS_DIGITS.format(col=col)} THEN CAST({col} AS INTEGER) END", f"{col} COLLATE NOCASE")
+    for col in PET_COLUMNS
+}
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase) # What COLLATE NOCASE folds
+
+def pet_sort_key(value: Any) -> Tuple[Any, ...]:
+    if value is None: return (0,)
+    text = str(value)
+    if text.isascii() and text.isdigit(): return (1, 0, int(text), text)
+    return (1, 1, text.translate(_ASCII_LOWER))
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+def _filtered_pets_params(search_term: str, species_filter: str, sex_filter: str, archived_filter: str) -> Dict[str, Any]:
+    return {
+        'search': f"%{search_term}%" if search_term else None,
+        'search_fts': _fts_phrase(search_term) if len(search_term) >= FTS_MIN_SEARCH_LENGTH else None,
+        'species': species_filter if species_filter and species_filter != "All" else None,
+        'sex': sex_filter if sex_filter and sex_filter != "All" else None,
+        'archived': ARCHIVED_FILTER_VALUES.get(archived_filter),
+    }
+
 def fetch_filtered_pets_from_db(app_config: configparser.ConfigParser,
                                 search_term: str = "",
                                 species_filter: str = "All",
                                 sex_filter: str = "All",
-                                archived_filter: str = "Active") -> List[Dict[str, Any]]:
+                                archived_filter: str = "Active",
+                                sort_column: Optional[str] = None,
+                                sort_reverse: bool = False,
+                                conn: Optional[sqlite3.Connection] = None,
+                                limit: int = -1,
+                                offset: int = 0) -> List[Dict[str, Any]]:
+    # limit=-1 returns every matching row.
     logger.debug(f"Fetching filtered pets. Search: '{search_term}', Species: '{species_filter}', Sex: '{sex_filter}', Archived: '{archived_filter}'")
     pets = []
-    query = f"SELECT {', '.join(PetSyncGUI.COLUMNS)} FROM pets" 
-    conditions = []
-    params = []
-
-    if search_term:
-        search_like = f"%{search_term}%"
-        conditions.append("(LOWER(id) LIKE LOWER(?) OR LOWER(name) LIKE LOWER(?) OR LOWER(species) LIKE LOWER(?) OR LOWER(breed) LIKE LOWER(?))")
-        params.extend([search_like] * 4)
-    if species_filter != "All" and species_filter:
-        conditions.append("LOWER(species) = LOWER(?)")
-        params.append(species_filter)
-    if sex_filter != "All" and sex_filter:
-        conditions.append("LOWER(sexSN) = LOWER(?)")
-        params.append(sex_filter)
-    if archived_filter == "Active":
-        conditions.append("archived = 0")
-    elif archived_filter == "Archived":
-        conditions.append("archived = 1")
+    params = _filtered_pets_params(search_term, species_filter, sex_filter, archived_filter)
+    params.update(limit=limit, offset=offset)
     
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-    query += " ORDER BY archived ASC, name ASC"
-    
-    logger.debug(f"Executing query: {query} with params: {params}")
+    logger.debug(f"Executing filtered pets query with params: {params}")
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            pets = [dict(row) for row in cursor.fetchall()]
+        cursor = (conn or get_conn()).cursor()
+        cursor.row_factory = sqlite3.Row
+        order_by = PET_DEFAULT_ORDER_BY
+        if sort_column in PET_SORT_ORDER_BY:
+            direction = 'DESC' if sort_reverse else 'ASC'
+            order_by = ', '.join(f"{term} {direction}" for term in PET_SORT_ORDER_BY[sort_column]) + ", id ASC"
+        cursor.execute(f"{FILTERED_PETS_SQL} ORDER BY {order_by} LIMIT :limit OFFSET :offset", params)
+        pets = [dict(row) for row in cursor.fetchall()]
         logger.info(f"Fetched {len(pets)} pets from local DB based on filters.")
     except sqlite3.Error as e:
         logger.error(f"Error fetching filtered pets from local DB: {e}", exc_info=True)
     return pets
 
+def count_filtered_pets_in_db(search_term: str = "",
+                              species_filter: str = "All",
+                              sex_filter: str = "All",
+                              archived_filter: str = "Active",
+                              conn: Optional[sqlite3.Connection] = None) -> int:
+    params = _filtered_pets_params(search_term, species_filter, sex_filter, archived_filter)
+    try:
+        return (conn or get_conn()).execute(COUNT_FILTERED_PETS_SQL, params).fetchone()[0]
+    except sqlite3.Error as e:
+        logger.error(f"Error counting filtered pets in local DB: {e}", exc_info=True)
+        return 0
+
 # --- Google Sheets Update Functions ---
-def update_google_sheet(pets_data: List[Dict[str, Any]]) -> bool:
+_SHEET_NUMBER_RE = re.compile(r'-?\d+(\.\d+)?')
+
+def _sheet_cell(value: Any) -> Dict[str, Any]:
+    # Plain numbers (e.g. pet IDs) are written as numbers, the way USER_ENTERED input parsed them before.
+    if value is None or value == '':
+        return {}
+    if isinstance(value, (int, float)):
+        return {'userEnteredValue': {'numberValue': value}}
+    if _SHEET_NUMBER_RE.fullmatch(str(value)):
+        return {'userEnteredValue': {'numberValue': float(value)}}
+    return {'userEnteredValue': {'stringValue': str(value)}}
+
+def _sheet_value(value: Any) -> Any:
+    # RAW values.batchUpdate counterpart of _sheet_cell, so delta writes store the same cell types as a full rewrite.
+    return next(iter(_sheet_cell(value).get('userEnteredValue', {}).values()), '')
+
+def _sheet_row_hash(row: List[Any]) -> str:
+    return hashlib.sha1(json.dumps(row, default=str).encode('utf-8')).hexdigest()
+
+def _build_sheet_rewrite_requests(sh: gspread.Worksheet, rows: List[List[Any]], row_count: int) -> List[Dict[str, Any]]:
+    # Size the grid to row_count, clear old values, write all rows and bold the header -- one round-trip.
+    sheet_id = sh.id
+    return [
+        {'updateSheetProperties': {
+            'properties': {'sheetId': sheet_id, 'gridProperties': {
+                'rowCount': row_count, 'columnCount': max(sh.col_count, len(rows[0]))}},
+            'fields': 'gridProperties(rowCount,columnCount)'}},
+        {'updateCells': {'range': {'sheetId': sheet_id}, 'fields': 'userEnteredValue'}},
+        {'updateCells': {
+            'start': {'sheetId': sheet_id, 'rowIndex': 0, 'columnIndex': 0},
+            'rows': [{'values': [_sheet_cell(v) for v in row]} for row in rows],
+            'fields': 'userEnteredValue'}},
+        {'repeatCell': {
+            'range': {'sheetId': sheet_id, 'startRowIndex': 0, 'endRowIndex': 1,
+                      'startColumnIndex': 0, 'endColumnIndex': len(rows[0])},
+            'cell': {'userEnteredFormat': {'textFormat': {'bold': True}}},
+            'fields': 'userEnteredFormat.textFormat.bold'}},
+    ]
+
+# The authorized client (and its pooled HTTP session) and the opened worksheet are reused across
+# updates; they are only rebuilt after an error, in case the sheet or credentials changed.
+_gsheet_lock = threading.Lock()
+_gsheet_client: Optional[gspread.Client] = None
+_gsheet_worksheet: Optional[gspread.Worksheet] = None
+
+def _get_gsheet_worksheet() -> gspread.Worksheet:
+    global _gsheet_client, _gsheet_worksheet
+    with _gsheet_lock:
+        if _gsheet_client is None:
+            logger.debug("Attempting to authenticate with Google service account...")
+            _gsheet_client = gspread.service_account(filename=GOOGLE_CREDENTIALS_FILE, scopes=SCOPES)
+            logger.info("Successfully authenticated with Google service account.")
+        if _gsheet_worksheet is None:
+            logger.debug(f"Attempting to open Google Sheet by ID: {GOOGLE_SHEET_ID}")
+            _gsheet_worksheet = _gsheet_client.open_by_key(GOOGLE_SHEET_ID).sheet1
+            logger.info(f"Successfully opened Google Sheet: '{_gsheet_worksheet.title}' (ID: {GOOGLE_SHEET_ID})")
+        return _gsheet_worksheet
+
+def _reset_gsheet_cache():
+    global _gsheet_client, _gsheet_worksheet
+    with _gsheet_lock:
+        _gsheet_client = None
+        _gsheet_worksheet = None
+
+def _gsheet_call(func: Callable[..., Any], *args: Any) -> Any:
+    # Honours Retry-After when the API sends one; otherwise waits 1, 2, 4... seconds plus jitter.
+    for attempt in range(1, GSHEET_MAX_ATTEMPTS + 1):
+        try:
+            return func(*args)
+        except gspread.exceptions.APIError as e:
+            status = e.response.status_code
+            if attempt == GSHEET_MAX_ATTEMPTS or not (status == 429 or status >= 500): raise
+            retry_after = e.response.headers.get('Retry-After', '')
+            delay = float(retry_after) if retry_after.isdigit() else 2 ** (attempt - 1) + random.uniform(0, 1)
+            delay = min(delay, GSHEET_BACKOFF_MAX_SECONDS)
+            logger.warning("Google Sheets API returned %s (attempt %d/%d); retrying in %.1fs.", status, attempt, GSHEET_MAX_ATTEMPTS, delay)
+            _backoff_sleep(delay)
+
+def _load_gsheet_row_hashes() -> Dict[int, str]:
+    return dict(get_conn().execute("SELECT row_num, row_hash FROM gsheet_rows"))
+
+def _load_gsheet_state() -> Dict[str, str]:
+    # 'payload_hash' of the last rows written, and 'grid_rows': the sheet's row count as we last set or grew it.
+    # The cached Worksheet's row_count goes stale once a batchUpdate resizes the grid, so it is only a fallback.
+    return dict(get_conn().execute("SELECT name, value FROM gsheet_state"))
+
+def _save_gsheet_row_hashes(changed: Dict[int, str], row_count: int, payload_hash: str, grid_rows: int):
+    conn = get_conn()
+    try:
+        conn.execute('BEGIN')
+        conn.executemany(
+            "INSERT INTO gsheet_state (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+            (('payload_hash', payload_hash), ('grid_rows', str(grid_rows)))
+        )
+        conn.execute("DELETE FROM gsheet_rows WHERE row_num > ?", (row_count,))
+        conn.executemany(
+            "INSERT INTO gsheet_rows (row_num, row_hash) VALUES (?, ?) "
+            "ON CONFLICT(row_num) DO UPDATE SET row_hash = excluded.row_hash",
+            changed.items()
+        )
+        conn.execute('COMMIT')
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+def _clear_gsheet_row_hashes():
+    # Forces the next update to rewrite the whole sheet, e.g. after a failed write left it in an unknown state.
+    try: get_conn().executescript("BEGIN; DELETE FROM gsheet_rows; DELETE FROM gsheet_state; COMMIT;")
+    except sqlite3.Error as e: logger.warning("Could not clear cached Google Sheet row hashes: %s", e)
+
+def _build_sheet_delta_data(sh: gspread.Worksheet, rows: List[List[Any]], row_hashes: List[str],
+                            previous_hashes: Dict[int, str]) -> Tuple[List[Dict[str, Any]], Dict[int, str]]:
+    # Rows are compared by position, so the sheet keeps the exact layout a full rewrite would give it.
+    # Consecutive changed rows share one range; rows past the new end are blanked.
+    data: List[Dict[str, Any]] = []
+    changed: Dict[int, str] = {}
+    next_row_in_range = None
+    for row_num, (row, row_hash) in enumerate(zip(rows, row_hashes), start=1):
+        if previous_hashes.get(row_num) == row_hash: continue
+        values = [_sheet_value(v) for v in row]
+        if row_num == next_row_in_range: data[-1]['values'].append(values)
+        else: data.append({'range': absolute_range_name(sh.title, f"A{row_num}"), 'values': [values]})
+        next_row_in_range = row_num + 1
+        changed[row_num] = row_hash
+    last_stale_row = max(previous_hashes, default=0)
+    if last_stale_row > len(rows):
+        first = len(rows) + 1
+        data.append({'range': absolute_range_name(sh.title, f"A{first}"), 'values': [[''] * len(rows[0])] * (last_stale_row - first + 1)})
+    return data, changed
+
+@dataclass
+class GSheetUpdateResult:
+    ok: bool
+    write_attempted: bool = False # A Sheets write was sent (or tried); False when the update was skipped or failed before any
+
+def update_google_sheet(pets_data: List[Dict[str, Any]]) -> GSheetUpdateResult:
     logger.info(f"Entering update_google_sheet function with {len(pets_data)} pets.")
     if not GOOGLE_SHEET_ID or GOOGLE_SHEET_ID == 'your_sheet_id_here':
         logger.error("Google Sheet ID is not configured. Please update GOOGLE_SHEET_ID constant.")
-        return False
+        return GSheetUpdateResult(ok=False)
     if not pets_data:
         logger.info("No pet data provided to update_google_sheet. Skipping actual sheet update.")
-        return True 
+        return GSheetUpdateResult(ok=True)
     logger.debug(f"Using GSheet ID: {GOOGLE_SHEET_ID}, Credentials file: {GOOGLE_CREDENTIALS_FILE}")
+    write_attempted = False
     try:
-        logger.debug("Attempting to authenticate with Google service account...")
-        gc = gspread.service_account(filename=GOOGLE_CREDENTIALS_FILE, scopes=SCOPES)
-        logger.info("Successfully authenticated with Google service account.")
-        logger.debug(f"Attempting to open Google Sheet by ID: {GOOGLE_SHEET_ID}")
-        sh = gc.open_by_key(GOOGLE_SHEET_ID).sheet1
-        logger.info(f"Successfully opened Google Sheet: '{sh.title}' (ID: {GOOGLE_SHEET_ID})")
         headers = ['ID', 'Name', 'Species', 'Breed', 'Sex/SN', 'Age', 'Location', 'Detail ID', 'Photo URL', 'Archived']
         rows_to_write = [headers]
         for pet in pets_data:
@@ -328,14 +718,37 @@ def update_google_sheet(pets_data: List[Dict[str, Any]]) -> bool:
                 pet.get('photo_url', ''), 'Yes' if pet.get('archived', 0) == 1 else 'No'
             ]
             rows_to_write.append(row)
-        logger.debug(f"Preparing to write {len(rows_to_write)} rows (including header) to sheet '{sh.title}'.")
-        sh.clear()
-        logger.debug("Sheet cleared. Updating with new data...")
-        sh.update('A1', rows_to_write, value_input_option='USER_ENTERED')
-        logger.debug("Sheet data updated. Formatting header...")
-        sh.format('A1:J1', {'textFormat': {'bold': True}})
-        logger.info(f"Google Sheet (ID: {GOOGLE_SHEET_ID}) updated successfully with {len(pets_data)} pets.")
-        return True
+        row_hashes = [_sheet_row_hash(row) for row in rows_to_write]
+        payload_hash = hashlib.blake2b(''.join(row_hashes).encode('ascii'), digest_size=16).hexdigest()
+        state = _load_gsheet_state()
+        if payload_hash == state.get('payload_hash'):
+            logger.info(f"Google Sheet data unchanged since the last successful update ({len(pets_data)} pets). Skipping update.")
+            return GSheetUpdateResult(ok=True)
+        sh = _get_gsheet_worksheet()
+        previous_hashes = _load_gsheet_row_hashes()
+        if not previous_hashes:
+            logger.debug(f"Preparing to write {len(rows_to_write)} rows (including header) to sheet '{sh.title}' in one batchUpdate.")
+            grid_rows = max(sh.row_count, len(rows_to_write))
+            write_attempted = True
+            _gsheet_call(sh.spreadsheet.batch_update, {'requests': _build_sheet_rewrite_requests(sh, rows_to_write, grid_rows)})
+            _save_gsheet_row_hashes(dict(enumerate(row_hashes, start=1)), len(rows_to_write), payload_hash, grid_rows)
+            logger.info(f"Google Sheet (ID: {GOOGLE_SHEET_ID}) rewritten successfully with {len(pets_data)} pets.")
+            return GSheetUpdateResult(ok=True, write_attempted=True)
+        data, changed = _build_sheet_delta_data(sh, rows_to_write, row_hashes, previous_hashes)
+        grid_rows = max(int(state.get('grid_rows', sh.row_count)), max(previous_hashes)) # Rows written before exist either way
+        if not data:
+            _save_gsheet_row_hashes({}, len(rows_to_write), payload_hash, grid_rows)
+            logger.info(f"Google Sheet (ID: {GOOGLE_SHEET_ID}) already up to date with {len(pets_data)} pets; nothing sent.")
+            return GSheetUpdateResult(ok=True)
+        write_attempted = True
+        if len(rows_to_write) > grid_rows:
+            _gsheet_call(sh.add_rows, len(rows_to_write) - grid_rows)
+            grid_rows = len(rows_to_write)
+        logger.debug(f"Sending {len(changed)} changed rows in {len(data)} ranges to sheet '{sh.title}' in one values.batchUpdate.")
+        _gsheet_call(sh.spreadsheet.values_batch_update, {'valueInputOption': 'RAW', 'data': data})
+        _save_gsheet_row_hashes(changed, len(rows_to_write), payload_hash, grid_rows)
+        logger.info(f"Google Sheet (ID: {GOOGLE_SHEET_ID}) updated successfully with {len(pets_data)} pets ({len(changed)} rows changed).")
+        return GSheetUpdateResult(ok=True, write_attempted=True)
     except gspread.exceptions.SpreadsheetNotFound:
         logger.error(f"Google Sheet with ID '{GOOGLE_SHEET_ID}' not found. "
                      "Ensure the ID is correct and the sheet is shared with the service account.", exc_info=True)
@@ -345,16 +758,35 @@ def update_google_sheet(pets_data: List[Dict[str, Any]]) -> bool:
     except FileNotFoundError:
         logger.error(f"Google credentials file ('{GOOGLE_CREDENTIALS_FILE}') not found. "
                      "Please ensure the file exists at this path and the script has permissions to read it.", exc_info=True)
+    except ShutdownRequested:
+        logger.info("Google Sheet update abandoned: application is shutting down.")
     except Exception as e:
         logger.error(f"An unexpected error occurred while updating Google Sheet (ID: {GOOGLE_SHEET_ID}): {e}", exc_info=True)
-    return False
+    _reset_gsheet_cache()
+    _clear_gsheet_row_hashes()
+    return GSheetUpdateResult(ok=False, write_attempted=write_attempted)
+
+# --- Pet Photo Thumbnails ---
+def _thumbnail_path(photo_url: str) -> str:
+    key = hashlib.blake2b(photo_url.encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(THUMBNAIL_DIR, f'{key}.png')
+
+def _load_thumbnail_photo(thumb_path: str) -> ImageTk.PhotoImage:
+    # Tk main thread only: PhotoImage wraps a Tk image.
+    with Image.open(thumb_path) as img:
+        return ImageTk.PhotoImage(img)
 
 # --- GUI Section ---
 class PetSyncGUI:
-    COLUMNS = ('id', 'name', 'species', 'breed', 'sexSN', 'age', 'location', 'detail_id', 'photo_url', 'archived')
+    COLUMNS = PET_COLUMNS
     SPECIES_OPTIONS = ["All", "Dog", "Cat"] # UPDATED
     SEX_OPTIONS = ["All", "Male", "Female", "Neutered Male", "Spayed Female", "Unknown"] 
     ARCHIVED_OPTIONS = ["Active", "Archived", "All"]
+    TREE_INSERT_BATCH_SIZE = 200
+    PAGE_SIZE = 200 # Rows loaded into the table per page; scrolling to the bottom loads the next one
+    ROW_COUNT_CACHE_SECONDS = 5
+    CONFIG_SAVE_DELAY_MS = 500
+    _TAGS = (('evenrow', 'oddrow'), ('archived', 'archived')) # [is_archived][row_idx & 1]
 
     def __init__(self, master: ThemedTk, initial_config: configparser.ConfigParser):
         self.master = master 
@@ -363,13 +795,46 @@ class PetSyncGUI:
         self.master.title(f"Petango Sync v{APP_VERSION}")
         self.master.geometry("1250x800")
         
-        self.scheduler = BackgroundScheduler(timezone="UTC")
+        # The job only hands work to self.executor, so one scheduler thread is plenty. Fires missed while
+        # the machine slept are coalesced into a single run instead of a burst of syncs.
+        self.scheduler = BackgroundScheduler(
+            timezone="UTC",
+            executors={'default': APSThreadPoolExecutor(1)},
+            job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': 300},
+        )
         self.sync_running = False
+        self._sync_state_lock = threading.Lock() # Guards sync_running; only held to read or flip it
+        self._scheduler_job_lock = threading.Lock() # Serializes APScheduler calls on the I/O pool, never taken on the Tk thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sync')
+        self._db_read = get_conn() # The Tk thread's long-lived connection for table reads; sync writes use the worker's own
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='pps-io') # Photo downloads; kept apart from sync work
+        self.ui_queue: "queue.Queue[Tuple[Callable[..., Any], Tuple[Any, ...]]]" = queue.Queue()
+        self._sync_future: Optional[Future] = None # The one sync/GSheet operation queued or running, if any
+        self._sync_future_lock = threading.Lock()
+        self._last_gsheet_push_ts = float('-inf') # time.monotonic() of the last push that wrote (or tried to write) to the sheet
         self._current_pet_photo: Optional[ImageTk.PhotoImage] = None
+        self._selected_photo_url: Optional[str] = None
+        self._pending_status: Optional[Tuple[str, bool]] = None # Latest status posted by a worker thread
+        self._pending_status_lock = threading.Lock()
+        self._errors_shown: Set[Tuple[str, str]] = set() # (title, message) pairs already shown in a dialog this session
+        self._errors_shown_lock = threading.Lock()
+        self._photo_cache: "OrderedDict[str, ImageTk.PhotoImage]" = OrderedDict() # photo_url -> PhotoImage (LRU)
+        self._config_save_pending: Optional[str] = None
+        self._populate_generation = 0
+        self._current_iids: Dict[str, Tuple[tuple, str]] = {} # iid -> (row values, tag) as shown in pet_tree
+        self._row_getter = operator.itemgetter(*self.COLUMNS) # Every fetched row carries all of COLUMNS
+        self._col_index = {col: idx for idx, col in enumerate(self.COLUMNS)}
+        self._page_index = 0 # Pages beyond the first loaded for the filters in _shown_filters
+        self._shown_filters: Optional[Tuple[str, str, str, str]] = None
+        self._total_rows = 0 # Rows matching _shown_filters, including those not loaded yet
+        self._row_count_cache: Optional[Tuple[Tuple[str, str, str, str], int, float]] = None # (filters, count, monotonic time)
+        self._populating = False # A refresh or page load is still applying rows
+        self._sort_state: Tuple[Optional[str], bool] = (None, False) # (column, descending) last picked via a heading
         
         self.current_theme_var = tk.StringVar(value=self.config.get('AppSettings', 'theme'))
         self.log_level_var = tk.StringVar(value=self.config.get('AppSettings', 'log_level'))
-        self.sync_archived_to_gsheet_var = tk.BooleanVar(value=self.config.getboolean('AppSettings', 'sync_archived_to_gsheet'))
+        self._sync_archived = self.config.getboolean('AppSettings', 'sync_archived_to_gsheet') # Kept in step by _save_app_setting; read by the sync worker
+        self.sync_archived_to_gsheet_var = tk.BooleanVar(value=self._sync_archived)
 
         self.search_term_var = tk.StringVar()
         self.species_filter_var = tk.StringVar(value="All")
@@ -378,10 +843,12 @@ class PetSyncGUI:
 
         self._apply_log_level() 
 
+        self._style = ttk.Style(self.master)
         self._setup_menubar()
         self._setup_ui() 
         self.master.protocol("WM_DELETE_WINDOW", self._on_closing)
         self.master.after(100, self.refresh_pet_table) 
+        self.master.after(UI_QUEUE_POLL_MS, self._drain_queue)
         self.update_button_states()
         self._update_last_synced_labels()
 
@@ -391,7 +858,19 @@ class PetSyncGUI:
         # Log is done by caller
 
     def _save_app_setting(self, key: str, value: Any):
-        self.config.set('AppSettings', key, str(value)); save_config(self.config)
+        # Settings changes in quick succession are written to disk once, CONFIG_SAVE_DELAY_MS after the last one.
+        self.config.set('AppSettings', key, str(value))
+        if key == 'sync_archived_to_gsheet': self._sync_archived = self.config.getboolean('AppSettings', key)
+        if self._config_save_pending is not None: self.master.after_cancel(self._config_save_pending)
+        self._config_save_pending = self.master.after(self.CONFIG_SAVE_DELAY_MS, self._flush_config)
+
+    def _flush_config(self):
+        if self._config_save_pending is not None: self.master.after_cancel(self._config_save_pending)
+        self._config_save_pending = None
+        save_config(self.config)
+
+    def _configure_styles(self):
+        self._style.configure("archived.Treeview", background="#FFDDDD", foreground="#555555")
 
     def _setup_menubar(self):
         menubar = tk.Menu(self.master); self.master.config(menu=menubar)
@@ -401,7 +880,7 @@ class PetSyncGUI:
             available_themes = sorted(self.master.get_themes())
             if not available_themes: raise tk.TclError("No themes from get_themes")
         except (AttributeError, tk.TclError): 
-            style = ttk.Style(); available_themes = sorted(style.theme_names())
+            available_themes = sorted(self._style.theme_names())
         
         current_theme_val = self.current_theme_var.get()
         if current_theme_val not in available_themes and available_themes:
@@ -431,8 +910,8 @@ class PetSyncGUI:
             if hasattr(self.master, 'set_theme'): 
                 self.master.set_theme(new_theme)
             else: 
-                style = ttk.Style(self.master)
-                style.theme_use(new_theme)
+                self._style.theme_use(new_theme)
+            self._configure_styles() # Style options are per-theme
             self._save_app_setting('theme', new_theme)
             logger.info(f"Theme changed successfully to: {new_theme}")
         except tk.TclError as e_ttk: 
@@ -499,6 +978,7 @@ class PetSyncGUI:
         tree_container_frame = ttk.Frame(main_content_frame)
         tree_container_frame.pack(side='left', fill='both', expand=True, padx=(0,5))
         self.pet_tree = ttk.Treeview(tree_container_frame, columns=self.COLUMNS, show='headings', height=18)
+        self._configure_styles()
         for col in self.COLUMNS:
             self.pet_tree.heading(col, text=col.replace('_', ' ').capitalize(), command=lambda _col=col: self._sort_column(_col, False))
             self.pet_tree.column(col, width=100, anchor="w", minwidth=60)
@@ -506,7 +986,8 @@ class PetSyncGUI:
         self.pet_tree.column('photo_url', width=200, minwidth=150); self.pet_tree.column('archived', width=70, anchor='center', minwidth=50)
         vsb = ttk.Scrollbar(tree_container_frame, orient="vertical", command=self.pet_tree.yview)
         hsb = ttk.Scrollbar(tree_container_frame, orient="horizontal", command=self.pet_tree.xview)
-        self.pet_tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self._tree_vsb = vsb
+        self.pet_tree.configure(yscrollcommand=self._on_tree_yscroll, xscrollcommand=hsb.set)
         vsb.pack(side='right', fill='y'); hsb.pack(side='bottom', fill='x')
         self.pet_tree.pack(side='left', fill='both', expand=True)
         self.pet_tree.bind("<<TreeviewSelect>>", self._on_pet_select)
@@ -525,7 +1006,43 @@ class PetSyncGUI:
         self.status_label = ttk.Label(status_bar_frame, text="Ready.", relief=tk.FLAT) 
         self.status_label.pack(side='right', fill='x', expand=True, padx=(10,0))
 
+    def _post(self, func: Callable[..., Any], *args: Any):
+        # Safe from any thread: func(*args) runs on the Tk main thread at the next queue drain.
+        self.ui_queue.put((func, args))
+
+    def _show_error_once(self, title: str, message: str):
+        # Safe from any thread. A failure that repeats every scheduled sync opens one dialog per session,
+        # not a stack of them; the status bar and log still report every occurrence.
+        with self._errors_shown_lock:
+            if (title, message) in self._errors_shown: return
+            self._errors_shown.add((title, message))
+        self._post(messagebox.showerror, title, message)
+
+    def _drain_queue(self):
+        if not self.master.winfo_exists(): return
+        self._flush_status()
+        while True:
+            try: func, args = self.ui_queue.get_nowait()
+            except queue.Empty: break
+            try: func(*args)
+            except Exception as e: logger.error("Error in queued UI callback %s: %s", getattr(func, '__name__', func), e, exc_info=True)
+        self.master.after(UI_QUEUE_POLL_MS, self._drain_queue)
+
+    def _submit_operation(self, func: Callable[..., Any], *args: Any) -> bool:
+        # Sync and GSheet work runs on the single worker thread, one operation at a time; button states follow the
+        # future. The check and the submit share a lock because APScheduler's thread submits too.
+        with self._sync_future_lock:
+            if self._operation_running() or _shutdown_event.is_set(): return False
+            future = self.executor.submit(func, *args)
+            self._sync_future = future
+        future.add_done_callback(lambda _f: self._post(self.update_button_states))
+        return True
+
+    def _operation_running(self) -> bool:
+        return self._sync_future is not None and not self._sync_future.done()
+
     def update_button_states(self, operation_running=False):
+        operation_running = operation_running or self._operation_running()
         is_auto_syncing = self.sync_running
         self.btn_start_sync.config(state='disabled' if is_auto_syncing or operation_running else 'normal')
         self.btn_stop_sync.config(state='normal' if is_auto_syncing and not operation_running else 'disabled')
@@ -534,22 +1051,40 @@ class PetSyncGUI:
     
     def _update_status(self, message: str, is_error: bool = False):
         if self.master.winfo_exists():
-            self.status_label.config(text=message) 
-            if is_error:
-                logger.error(f"GUI Status Update (Error): {message}")
-                self.status_label.config(foreground="red") 
-            else:
-                logger.info(f"GUI Status Update: {message}")
-                self.status_label.config(foreground="") 
+            self._log_status(message, is_error)
+            self._apply_status(message, is_error)
+
+    def _update_status_async(self, message: str, is_error: bool = False):
+        # Safe from any thread. Only the latest pending message reaches the label, at the next queue drain.
+        self._log_status(message, is_error)
+        with self._pending_status_lock: self._pending_status = (message, is_error)
+
+    def _flush_status(self):
+        # Read and clear as one step, so a status posted in between is kept for the next drain, not dropped.
+        with self._pending_status_lock: pending, self._pending_status = self._pending_status, None
+        if pending is not None: self._apply_status(*pending)
+
+    def _log_status(self, message: str, is_error: bool):
+        if is_error: logger.error(f"GUI Status Update (Error): {message}")
+        else: logger.info(f"GUI Status Update: {message}")
+
+    def _apply_status(self, message: str, is_error: bool):
+        self.status_label.config(text=message, foreground="red" if is_error else "")
     
     def _sort_column(self, col: str, reverse: bool):
+        # When every matching row is loaded, reorders them from the cached row values (no per-row Tk
+        # reads or query); later refreshes get the same order from SQL via _sort_state.
+        self._sort_state = (col, reverse)
+        if len(self._current_iids) < self._total_rows: # Only some pages are loaded; the next ones must continue the new order
+            self.pet_tree.heading(col, command=lambda _col=col: self._sort_column(_col, not reverse))
+            self.refresh_pet_table()
+            return
         try:
-            data = [(self.pet_tree.set(child, col), child) for child in self.pet_tree.get_children('')]
-            def sort_key(item):
-                try: return int(item[0])
-                except ValueError: return str(item[0]).lower()
-            data.sort(key=sort_key, reverse=reverse)
-            for index, (val, child) in enumerate(data): self.pet_tree.move(child, '', index)
+            col_idx = self._col_index[col]
+            # Sorting the ids first makes ties come out in the same 'id ASC' order the SQL path uses.
+            order = sorted(sorted(self._current_iids), key=lambda iid: pet_sort_key(self._current_iids[iid][0][col_idx]),
+                           reverse=reverse)
+            if order: self.pet_tree.set_children('', *order)
             self.pet_tree.heading(col, command=lambda _col=col: self._sort_column(_col, not reverse))
         except Exception as e: logger.error("Error sorting column %s: %s", col, e, exc_info=True); self._update_status(f"Error sorting: {e}", True)
 
@@ -566,65 +1101,94 @@ class PetSyncGUI:
         self.refresh_pet_table()
 
     def start_auto_sync(self):
-        if not self.sync_running:
-            try:
-                self.sync_running = True 
-                self.update_button_states()
-                self._update_status("Attempting to start automatic hourly sync...")
-                self.trigger_manual_sync_all(scheduled_job=True) 
-                self.scheduler.add_job(self._scheduled_sync_all_task, 'interval', hours=1, id='pet_sync_job')
-                if self.scheduler.state != STATE_RUNNING: self.scheduler.start(paused=False) 
-                self._update_status("Automatic hourly sync (DB & Google Sheet) configured.")
-            except Exception as e:
-                self.sync_running = False 
-                logger.error("Failed to start scheduler: %s", e, exc_info=True)
-                self._update_status(f"Error starting scheduler: {e}", True); messagebox.showerror("Scheduler Error", f"Could not start: {e}")
-            finally: self.update_button_states() 
+        with self._sync_state_lock:
+            if self.sync_running: return
+            self.sync_running = True
+        self.update_button_states()
+        self._update_status("Attempting to start automatic hourly sync...")
+        self.trigger_manual_sync_all(scheduled_job=True) 
+        self._io_pool.submit(self._start_scheduler_job) # APScheduler start-up stays off the Tk thread
+
+    def _auto_sync_wanted(self) -> bool:
+        with self._sync_state_lock: return self.sync_running
+
+    def _start_scheduler_job(self):
+        try:
+            with self._scheduler_job_lock:
+                if not self._auto_sync_wanted(): return # Stopped again before this ran
+                self.scheduler.add_job(self._scheduled_sync_all_task, 'interval', hours=1, id='pet_sync_job', replace_existing=True)
+                if self.scheduler.state != STATE_RUNNING: self.scheduler.start(paused=False)
+                if not self._auto_sync_wanted(): # Stopped while the job was being added; the queued stop finds nothing to do
+                    if self.scheduler.get_job('pet_sync_job'): self.scheduler.remove_job('pet_sync_job')
+                    return
+            self._update_status_async("Automatic hourly sync (DB & Google Sheet) configured.")
+        except Exception as e:
+            with self._sync_state_lock: self.sync_running = False 
+            logger.error("Failed to start scheduler: %s", e, exc_info=True)
+            self._update_status_async(f"Error starting scheduler: {e}", True); self._show_error_once("Scheduler Error", f"Could not start: {e}")
+        finally: self._post(self.update_button_states)
 
     def stop_auto_sync(self):
-        if self.sync_running:
-            try:
+        with self._sync_state_lock:
+            if not self.sync_running: return
+            self.sync_running = False
+        self.update_button_states()
+        self._io_pool.submit(self._stop_scheduler_job)
+
+    def _stop_scheduler_job(self):
+        try:
+            with self._scheduler_job_lock:
+                if self._auto_sync_wanted(): return # Restarted before this ran
                 if self.scheduler.get_job('pet_sync_job'): self.scheduler.remove_job('pet_sync_job')
-                self.sync_running = False
-                self._update_status("Automatic sync stopped.")
-            except Exception as e: logger.error("Failed to stop scheduler: %s", e, exc_info=True); self._update_status(f"Error stopping scheduler: {e}", True)
-            finally: self.update_button_states()
+            self._update_status_async("Automatic sync stopped.")
+        except Exception as e: logger.error("Failed to stop scheduler: %s", e, exc_info=True); self._update_status_async(f"Error stopping scheduler: {e}", True)
+        finally: self._post(self.update_button_states)
 
     def _scheduled_sync_all_task(self):
         logger.info("Scheduled sync task (DB & Google Sheet) initiated by APScheduler.")
-        threading.Thread(target=self._perform_sync_and_update_all, args=("Scheduled sync",), daemon=True).start()
+        if not self._submit_operation(self._perform_sync_and_update_all, "Scheduled sync"):
+            logger.info("Scheduled sync skipped: another sync/update is still running.")
+            return
+        self._post(self.update_button_states)
 
     def trigger_manual_sync_all(self, scheduled_job: bool = False):
         sync_type = "Initial auto-sync" if scheduled_job else "Manual Full Sync"
+        if self._operation_running():
+            logger.info("%s requested while another sync/update is still running. Ignoring.", sync_type)
+            return
         self._update_status(f"{sync_type} (DB & Google Sheet) requested...")
-        self.update_button_states(operation_running=True)
-        threading.Thread(target=self._perform_sync_and_update_all, args=(sync_type,), daemon=True).start()
+        self._submit_operation(self._perform_sync_and_update_all, sync_type)
+        self.update_button_states()
+
+    def _gsheet_archived_filter(self) -> str:
+        return "All" if self._sync_archived else "Active"
+
+    def _push_to_gsheet(self, pets: List[Dict[str, Any]]) -> bool:
+        result = update_google_sheet(pets)
+        if result.write_attempted: self._last_gsheet_push_ts = time.monotonic() # Skipped pushes cost no quota
+        return result.ok
 
     def _perform_sync_and_update_all(self, sync_type_msg: str):
         full_task_name = f"{sync_type_msg} (DB & GSheet)"
-        self.master.after(0, lambda: self._update_status(f"{full_task_name} in progress..."))
+        self._update_status_async(f"{full_task_name} in progress...")
         db_sync_ok = False; gsheet_update_ok = False; any_pets_for_sheet = False
         current_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         try:
             logger.info(f"Starting: {full_task_name}")
-            sync_database(); db_sync_ok = True
+            if sync_database() == 0:
+                # A markup change can make every page parse to nothing; don't let that pass as a successful sync.
+                self._update_status_async(f"{full_task_name}: Petango returned no animals; local DB unchanged.", True)
+                return
+            db_sync_ok = True
             logger.info("Local DB sync successful for %s. Preparing Google Sheet update.", sync_type_msg)
+            _raise_if_shutting_down()
             
-            all_pets_from_db = fetch_filtered_pets_from_db(self.config, archived_filter="All")
-            any_pets_for_sheet = bool(all_pets_from_db)
+            pets_to_send_to_gsheet = fetch_filtered_pets_from_db(self.config, archived_filter=self._gsheet_archived_filter())
+            any_pets_for_sheet = bool(pets_to_send_to_gsheet)
 
             if any_pets_for_sheet:
-                if self.config.getboolean('AppSettings', 'sync_archived_to_gsheet'):
-                    pets_to_send_to_gsheet = all_pets_from_db
-                else:
-                    pets_to_send_to_gsheet = [p for p in all_pets_from_db if not p.get('archived')]
-                
                 logger.info("Calling update_google_sheet for %s with %d pets...", sync_type_msg, len(pets_to_send_to_gsheet))
-                if pets_to_send_to_gsheet: 
-                    gsheet_update_ok = update_google_sheet(pets_to_send_to_gsheet)
-                else: 
-                    logger.info("No pets to send to GSheet after applying 'sync_archived_to_gsheet' setting.")
-                    gsheet_update_ok = True 
+                gsheet_update_ok = self._push_to_gsheet(pets_to_send_to_gsheet)
                 logger.info(f"update_google_sheet call completed for {sync_type_msg}. Success: {gsheet_update_ok}")
             else:
                 logger.info("No pets in local DB to update GSheet with for %s. GSheet update effectively skipped.", sync_type_msg)
@@ -636,61 +1200,58 @@ class PetSyncGUI:
             elif db_sync_ok and any_pets_for_sheet and not gsheet_update_ok: status_msg += " (DB OK, GSheet update FAILED - check logs)"; final_status_is_error = True
             
             if db_sync_ok and gsheet_update_ok:
-                self._save_app_setting('last_successful_sync_all', current_time_str)
-                self._save_app_setting('last_successful_gsheet_update', current_time_str)
-                self.master.after(0, self._update_last_synced_labels)
-
-            self.master.after(0, lambda: self._update_status(status_msg, final_status_is_error))
-            if db_sync_ok: self.master.after(0, self.refresh_pet_table)
-        except ConnectionError as e: logger.error(f"Connection error during {full_task_name}: {e}", exc_info=True); self.master.after(0, lambda: self._update_status(f"{full_task_name} (Petango fetch) FAILED: {e}", True)); self.master.after(0, lambda: messagebox.showerror("Sync Error", f"Could not fetch Petango data: {e}"))
-        except sqlite3.Error as e: logger.error(f"SQLite error during {full_task_name}: {e}", exc_info=True); self.master.after(0, lambda: self._update_status(f"{full_task_name} (local DB) FAILED: {e}", True)); self.master.after(0, lambda: messagebox.showerror("Sync Error", f"Local database operation failed: {e}"))
+                self._post(self._save_app_setting, 'last_successful_sync_all', current_time_str)
+                self._post(self._save_app_setting, 'last_successful_gsheet_update', current_time_str)
+                self._post(self._update_last_synced_labels)
+
+            self._update_status_async(status_msg, final_status_is_error)
+            if db_sync_ok: self._post(self._refresh_after_sync)
+        except ShutdownRequested: logger.info(f"{full_task_name} abandoned: application is shutting down.")
+        except ConnectionError as e: logger.error(f"Connection error during {full_task_name}: {e}", exc_info=True); self._update_status_async(f"{full_task_name} (Petango fetch) FAILED: {e}", True); self._show_error_once("Sync Error", f"Could not fetch Petango data: {e}")
+        except sqlite3.Error as e: logger.error(f"SQLite error during {full_task_name}: {e}", exc_info=True); self._update_status_async(f"{full_task_name} (local DB) FAILED: {e}", True); self._show_error_once("Sync Error", f"Local database operation failed: {e}")
         except Exception as e:
             logger.error(f"Unexpected error during {full_task_name}: {e}", exc_info=True)
             err_msg = f"{full_task_name} FAILED: {e}"
             if db_sync_ok: err_msg = f"Local DB sync OK for {sync_type_msg}, but subsequent GSheet update/other error: {e}"
-            self.master.after(0, lambda: self._update_status(err_msg, True)); self.master.after(0, lambda: messagebox.showerror("Sync Error", f"An unexpected error occurred: {e}"))
-        finally: self.master.after(0, self.update_button_states)
+            self._update_status_async(err_msg, True); self._show_error_once("Sync Error", f"An unexpected error occurred: {e}")
 
     def trigger_manual_gsheet_update(self):
+        if self._operation_running():
+            logger.info("Manual Google Sheet update requested while another sync/update is still running. Ignoring.")
+            return
+        wait_seconds = GSHEET_MIN_MANUAL_INTERVAL_SECONDS - (time.monotonic() - self._last_gsheet_push_ts)
+        if wait_seconds > 0:
+            self._update_status(f"Google Sheet update throttled - try again in {int(wait_seconds) + 1}s.")
+            return
         self._update_status("Manual Google Sheet update requested...")
-        self.update_button_states(operation_running=True)
-        threading.Thread(target=self._perform_gsheet_update_task, daemon=True).start()
+        self._submit_operation(self._perform_gsheet_update_task)
+        self.update_button_states()
 
     def _perform_gsheet_update_task(self):
-        self.master.after(0, lambda: self._update_status("Manual GSheet update in progress..."))
+        self._update_status_async("Manual GSheet update in progress...")
         logger.info("Starting manual Google Sheet update task.")
         gsheet_update_ok = False; any_pets_for_sheet = False
         current_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         try:
-            all_pets_from_db = fetch_filtered_pets_from_db(self.config, archived_filter="All")
-            any_pets_for_sheet = bool(all_pets_from_db)
+            pets_to_send_to_gsheet = fetch_filtered_pets_from_db(self.config, archived_filter=self._gsheet_archived_filter())
+            any_pets_for_sheet = bool(pets_to_send_to_gsheet)
             if any_pets_for_sheet:
-                if self.config.getboolean('AppSettings', 'sync_archived_to_gsheet'):
-                    pets_to_send_to_gsheet = all_pets_from_db
-                else:
-                    pets_to_send_to_gsheet = [p for p in all_pets_from_db if not p.get('archived')]
-
                 logger.info("Calling update_google_sheet for manual GSheet update with %d pets...", len(pets_to_send_to_gsheet))
-                if pets_to_send_to_gsheet:
-                    gsheet_update_ok = update_google_sheet(pets_to_send_to_gsheet)
-                else:
-                    logger.info("No pets to send to GSheet after applying 'sync_archived_to_gsheet' setting for manual update.")
-                    gsheet_update_ok = True
+                gsheet_update_ok = self._push_to_gsheet(pets_to_send_to_gsheet)
                 logger.info(f"Manual update_google_sheet call completed. Success: {gsheet_update_ok}")
                 if gsheet_update_ok:
-                    self.master.after(0, lambda: self._update_status(f"Manual GSheet update complete at {datetime.now().strftime('%H:%M:%S')}."))
-                    self._save_app_setting('last_successful_gsheet_update', current_time_str)
-                    self.master.after(0, self._update_last_synced_labels)
-                else: self.master.after(0, lambda: self._update_status("Manual GSheet update FAILED. Check logs.", True))
+                    self._update_status_async(f"Manual GSheet update complete at {datetime.now().strftime('%H:%M:%S')}.")
+                    self._post(self._save_app_setting, 'last_successful_gsheet_update', current_time_str)
+                    self._post(self._update_last_synced_labels)
+                else: self._update_status_async("Manual GSheet update FAILED. Check logs.", True)
             else:
                 logger.info("No pets in local DB to update GSheet with for manual update.")
-                self.master.after(0, lambda: self._update_status("No data in local DB for GSheet update."))
+                self._update_status_async("No data in local DB for GSheet update.")
                 gsheet_update_ok = True 
         except Exception as e:
             logger.error(f"Error during manual GSheet update task: {e}", exc_info=True)
-            self.master.after(0, lambda: self._update_status(f"Manual GSheet update FAILED: {e}", True))
-            self.master.after(0, lambda: messagebox.showerror("GSheet Update Error", f"An error occurred: {e}"))
-        finally: self.master.after(0, self.update_button_states)
+            self._update_status_async(f"Manual GSheet update FAILED: {e}", True)
+            self._show_error_once("GSheet Update Error", f"An error occurred: {e}")
 
     def refresh_pet_table(self):
         if not self.master.winfo_exists(): return
@@ -700,25 +1261,106 @@ class PetSyncGUI:
         archived_status = self.archived_filter_var.get()
         logger.info(f"Refreshing pet table. Filters - Search: '{search_term}', Species: '{species}', Sex: '{sex}', Status: '{archived_status}'")
         
-        filtered_pets = fetch_filtered_pets_from_db(self.config, search_term, species, sex, archived_status)
-        for i in self.pet_tree.get_children(): self.pet_tree.delete(i)
+        filters = (search_term, species, sex, archived_status)
+        if filters != self._shown_filters: self._page_index = 0 # New filters start again from the first page
+        self._shown_filters = filters
+        self._total_rows = self._filtered_row_count(filters)
+        sort_column, sort_reverse = self._sort_state
+        filtered_pets = fetch_filtered_pets_from_db(self.config, *filters, sort_column, sort_reverse, conn=self._db_read,
+                                                    limit=(self._page_index + 1) * self.PAGE_SIZE)
+        self._populate_generation += 1 # Abandons any batches still queued from an earlier refresh
+        new_rows: Dict[str, Tuple[tuple, str]] = {}
+        for row_idx, row_data_dict in enumerate(filtered_pets):
+            row_values = self._row_getter(row_data_dict)
+            tag_name = self._TAGS[row_data_dict['archived'] == 1][row_idx & 1]
+            new_rows[str(row_data_dict['id'])] = (row_values, tag_name)
+        # Only rows that were added, removed or changed since the last refresh touch the Treeview.
+        old_rows = self._current_iids
+        to_delete = [iid for iid in old_rows if iid not in new_rows]
+        changes = [(iid, row, iid not in old_rows) for iid, row in new_rows.items() if old_rows.get(iid) != row]
+        if to_delete:
+            self.pet_tree.delete(*to_delete)
+            for iid in to_delete: del old_rows[iid]
+        if not self.pet_tree.selection():
+            self._update_photo_panel_display(None, "Select a pet to see photo")
+            self._selected_photo_url = None
         if not filtered_pets:
+            self._populating = False
             logger.info("No pets found matching current filter criteria.")
             self._update_status("No pets match current filters.")
             return
+        logger.debug("Pet table diff: %d removed, %d added/changed, %d unchanged.", len(to_delete), len(changes), len(new_rows) - len(changes))
+        self._populating = True
+        self._apply_pet_row_changes(self._populate_generation, changes, 0, list(new_rows))
+
+    def _refresh_after_sync(self):
+        self._row_count_cache = None # The sync may have added or archived pets
+        self.refresh_pet_table()
+
+    def _filtered_row_count(self, filters: Tuple[str, str, str, str]) -> int:
+        # Scrolling and re-sorting refresh often; the COUNT(*) is reused for a few seconds per filter set.
+        cached = self._row_count_cache
+        if cached is not None and cached[0] == filters and time.monotonic() - cached[2] < self.ROW_COUNT_CACHE_SECONDS:
+            return cached[1]
+        total = count_filtered_pets_in_db(*filters, conn=self._db_read)
+        self._row_count_cache = (filters, total, time.monotonic())
+        return total
+
+    def _on_tree_yscroll(self, first: str, last: str):
+        self._tree_vsb.set(first, last)
+        if float(last) >= 1.0 and not self._populating and len(self._current_iids) < self._total_rows:
+            self._populating = True # Until _load_next_page has run; stops repeated scroll events queuing more loads
+            self.master.after_idle(self._load_next_page)
+
+    def _load_next_page(self):
+        # Appends the next PAGE_SIZE rows in the current SQL order after the rows already shown.
+        if not self.master.winfo_exists() or self._shown_filters is None: return
+        offset = len(self._current_iids)
+        sort_column, sort_reverse = self._sort_state
+        page = fetch_filtered_pets_from_db(self.config, *self._shown_filters, sort_column, sort_reverse, conn=self._db_read,
+                                           limit=self.PAGE_SIZE, offset=offset)
+        changes = []
+        for row_idx, row_data_dict in enumerate(page, start=offset):
+            iid = str(row_data_dict['id'])
+            if iid in self._current_iids: continue # Rows shifted since the last page was loaded
+            changes.append((iid, (self._row_getter(row_data_dict), self._TAGS[row_data_dict['archived'] == 1][row_idx & 1]), True))
+        if not changes:
+            self._populating = False
+            self._total_rows = offset # Nothing more to load, whatever the cached count said
+            return
+        self._page_index += 1
+        self._populate_generation += 1
+        order = list(self.pet_tree.get_children()) + [iid for iid, _row, _is_new in changes]
+        self._apply_pet_row_changes(self._populate_generation, changes, 0, order)
+
+    def _apply_pet_row_changes(self, generation: int, changes: List[Tuple[str, Tuple[tuple, str], bool]], start: int, order: List[str]):
+        # Changes go in TREE_INSERT_BATCH_SIZE at a time, yielding to the Tk event loop between batches.
+        if generation != self._populate_generation or not self.master.winfo_exists(): return
+        end = min(start + self.TREE_INSERT_BATCH_SIZE, len(changes))
+        selectmode = str(self.pet_tree.cget('selectmode'))
+        self.pet_tree.configure(selectmode='none')
         try:
-            for row_idx, row_data_dict in enumerate(filtered_pets):
-                row_values = [row_data_dict.get(col, "") for col in self.COLUMNS]
-                tag_name = 'archived' if row_data_dict.get('archived') == 1 else ('evenrow' if row_idx % 2 == 0 else 'oddrow')
-                self.pet_tree.insert('', 'end', values=row_values, tags=(tag_name,))
-            style = ttk.Style()
-            style.configure("archived.Treeview", background="#FFDDDD", foreground="#555555") 
-            self._update_photo_panel_display(None, "Select a pet to see photo")
-            self._current_pet_photo = None
-            self._update_status(f"Pet table refreshed. Displaying {len(filtered_pets)} pets.")
+            for iid, row, is_new in changes[start:end]:
+                row_values, tag_name = row
+                if is_new: self.pet_tree.insert('', 'end', iid=iid, values=row_values, tags=(tag_name,))
+                else: self.pet_tree.item(iid, values=row_values, tags=(tag_name,))
+                self._current_iids[iid] = row
+            if end >= len(changes) and self.pet_tree.get_children() != tuple(order):
+                self.pet_tree.set_children('', *order)
         except Exception as e:
+            self._populate_generation += 1; self._populating = False
+            # The tree may now be partially applied; forget the cache so the next refresh rebuilds it.
+            self.pet_tree.delete(*self.pet_tree.get_children()); self._current_iids = {}
             logger.error("Failed to populate pet table: %s", e, exc_info=True)
             self._update_status(f"Error refreshing table: {e}", True); messagebox.showerror("Table Error", f"Could not display data: {e}")
+            return
+        finally:
+            self.pet_tree.configure(selectmode=selectmode)
+        if end < len(changes):
+            self.master.after_idle(self._apply_pet_row_changes, generation, changes, end, order)
+        else:
+            self._populating = False
+            self._update_status(f"Showing rows 1-{len(order)} of {max(self._total_rows, len(order))}.")
 
     def _on_pet_select(self, event: Optional[tk.Event]):
         selected_items = self.pet_tree.selection()
@@ -728,18 +1370,47 @@ class PetSyncGUI:
         pet_data = dict(zip(self.COLUMNS, item_values))
         photo_url = pet_data.get('photo_url')
         if photo_url and photo_url != 'None' and photo_url.strip():
-            self._update_photo_panel_display(None, "Loading image...")
-            threading.Thread(target=self._load_image_threaded, args=(photo_url,), daemon=True).start()
-        else: self._update_photo_panel_display(None, "No image available for this pet.")
+            self._selected_photo_url = photo_url
+            cached_photo = self._photo_cache.get(photo_url)
+            if cached_photo is not None:
+                self._photo_cache.move_to_end(photo_url)
+                self._update_photo_panel_display(cached_photo, None)
+                return
+            thumb_path = _thumbnail_path(photo_url)
+            if os.path.exists(thumb_path):
+                self._on_photo_loaded(photo_url, thumb_path, None)
+            else:
+                self._update_photo_panel_display(None, "Loading image...")
+                self._io_pool.submit(self._load_image_threaded, photo_url, thumb_path)
+        else: self._selected_photo_url = None; self._update_photo_panel_display(None, "No image available for this pet.")
+
+    def _load_image_threaded(self, photo_url: str, thumb_path: str):
+        # Downloads and downsizes once; the PNG thumbnail on disk serves every later selection.
+        try:
+            with PHOTO_SESSION.get(photo_url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True # Let urllib3 undo any Content-Encoding while Pillow reads
+                img = Image.open(response.raw)
+                img.draft('RGB', THUMBNAIL_SIZE) # JPEGs decode straight at a reduced scale (libjpeg DCT scaling); no-op otherwise
+                img.load() # Decode while the response is open; thumbnail() skips loading images that are already small
+                img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.BILINEAR) # Returns untouched when already small enough
+            if img.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'): img = img.convert('RGB')
+            os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+            tmp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+            img.save(tmp_path, format='PNG'); os.replace(tmp_path, thumb_path)
+            self._post(self._on_photo_loaded, photo_url, thumb_path, None)
+        except requests.exceptions.RequestException as e: logger.warning("Failed to load image from %s: %s", photo_url, e); self._post(self._on_photo_loaded, photo_url, None, f"Failed to load image:\n{e}")
+        except Exception as e: logger.error("Error processing image from %s: %s", photo_url, e, exc_info=True); self._post(self._on_photo_loaded, photo_url, None, f"Error displaying image:\n{e}")
 
-    def _load_image_threaded(self, photo_url: str):
+    def _on_photo_loaded(self, photo_url: str, thumb_path: Optional[str], error_message: Optional[str]):
+        if photo_url != self._selected_photo_url: return # The user has since selected another pet
+        if thumb_path is None: self._update_photo_panel_display(None, error_message); return
         try:
-            response = requests.get(photo_url, timeout=10); response.raise_for_status()
-            img = Image.open(BytesIO(response.content)); img.thumbnail((250, 250), Image.Resampling.LANCZOS)
-            photo_image = ImageTk.PhotoImage(img)
-            self.master.after(0, lambda: self._update_photo_panel_display(photo_image, None))
-        except requests.exceptions.RequestException as e: logger.warning("Failed to load image from %s: %s", photo_url, e); self.master.after(0, lambda: self._update_photo_panel_display(None, f"Failed to load image:\n{e}"))
-        except Exception as e: logger.error("Error processing image from %s: %s", photo_url, e, exc_info=True); self.master.after(0, lambda: self._update_photo_panel_display(None, f"Error displaying image:\n{e}"))
+            photo = _load_thumbnail_photo(thumb_path)
+            self._photo_cache[photo_url] = photo
+            if len(self._photo_cache) > PHOTO_CACHE_MAX_ENTRIES: self._photo_cache.popitem(last=False)
+            self._update_photo_panel_display(photo, None)
+        except Exception as e: logger.error("Error displaying cached thumbnail %s: %s", thumb_path, e, exc_info=True); self._update_photo_panel_display(None, f"Error displaying image:\n{e}")
 
     def _update_photo_panel_display(self, image: Optional[ImageTk.PhotoImage], text_message: Optional[str]):
         if not self.master.winfo_exists(): return
@@ -750,20 +1421,33 @@ class PetSyncGUI:
         log_win = tk.Toplevel(self.master); log_win.title("Application Debug Log"); log_win.geometry("800x600")
         txt_area = scrolledtext.ScrolledText(log_win, width=120, height=40, wrap=tk.WORD, state='disabled')
         txt_area.pack(padx=10, pady=10, fill='both', expand=True)
+        lines_shown = 0
         def _refresh_log_content():
-            txt_area.config(state='normal'); txt_area.delete('1.0', 'end')
-            txt_area.insert('end', "\n".join(log_buffer)); txt_area.yview_moveto(1.0)
+            # Appends only what was logged since the last refresh instead of reloading the whole buffer.
+            nonlocal lines_shown
+            new_lines, lines_shown = tk_log_handler.lines_since(lines_shown)
+            if not new_lines: return
+            txt_area.config(state='normal')
+            txt_area.insert('end', "\n".join(new_lines) + "\n"); txt_area.yview_moveto(1.0)
             txt_area.config(state='disabled')
+        def _clear_log_content():
+            nonlocal lines_shown
+            with tk_log_handler.lock: log_buffer.clear(); lines_shown = tk_log_handler.lines_emitted
+            txt_area.config(state='normal'); txt_area.delete('1.0', 'end'); txt_area.config(state='disabled')
         _refresh_log_content()
         btn_frame = ttk.Frame(log_win, padding=5); btn_frame.pack()
         ttk.Button(btn_frame, text="Refresh Log", command=_refresh_log_content).pack(side='left', padx=5)
-        ttk.Button(btn_frame, text="Clear Log Buffer", command=lambda: (log_buffer.clear(), _refresh_log_content())).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Clear Log Buffer", command=_clear_log_content).pack(side='left', padx=5)
         ttk.Button(btn_frame, text="Close", command=log_win.destroy).pack(side='left', padx=5)
         log_win.transient(self.master); log_win.grab_set()
 
     def _on_closing(self):
         if messagebox.askokcancel("Quit", f"Do you want to quit Petango Sync v{APP_VERSION}?"):
             logger.info("Application shutting down...")
+            with self._sync_future_lock: _shutdown_event.set() # No operation can be submitted after this
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self._io_pool.shutdown(wait=False, cancel_futures=True)
+            if self._config_save_pending is not None: self._flush_config()
             if self.sync_running and self.scheduler.state == STATE_RUNNING: 
                 logger.info("Attempting to shut down scheduler...")
                 try: 
@@ -771,9 +1455,25 @@ class PetSyncGUI:
                     logger.info("Scheduler shut down.")
                 except Exception as e: 
                     logger.error("Error shutting down scheduler: %s", e, exc_info=True)
+            # A sync still running may be mid-transaction; its (only) future closes the connections when it ends.
+            if self._operation_running(): self._sync_future.add_done_callback(lambda _f: close_db_connections())
+            else: close_db_connections()
             self.master.destroy()
 
 # --- Main Application Execution ---
+def apply_fallback_ttk_theme(style: ttk.Style, preferred_theme: str) -> str:
+    # Used when ThemedTk is unavailable: prefer the configured theme, else 'clam', else whatever ttk offers.
+    available_ttk_themes = style.theme_names()
+    final_theme_to_use = preferred_theme
+    if preferred_theme not in available_ttk_themes: 
+        final_theme_to_use = 'clam' if 'clam' in available_ttk_themes else (available_ttk_themes[0] if available_ttk_themes else 'default')
+    try:
+        if final_theme_to_use : style.theme_use(final_theme_to_use)
+        logger.info(f"Applied fallback ttk theme: {final_theme_to_use}")
+    except tk.TclError:
+         logger.warning(f"Could not apply any fallback ttk themes, using Tk default: {style.theme_use()}")
+    return style.theme_use()
+
 def launch_gui():
     app_config = load_config()
     initial_theme = app_config.get('AppSettings', 'theme', fallback=DEFAULT_SETTINGS['theme'])
@@ -791,16 +1491,7 @@ def launch_gui():
         except tk.TclError as e:
             logger.warning(f"Failed to apply ThemedTk theme ('{initial_theme}'): {e}. Falling back to standard Tk with ttk theme attempt.")
             root = tk.Tk() 
-            style = ttk.Style(root)
-            available_ttk_themes = style.theme_names()
-            final_theme_to_use = initial_theme
-            if initial_theme not in available_ttk_themes: 
-                final_theme_to_use = 'clam' if 'clam' in available_ttk_themes else (available_ttk_themes[0] if available_ttk_themes else 'default')
-            try:
-                if final_theme_to_use : style.theme_use(final_theme_to_use)
-                logger.info(f"Applied fallback ttk theme: {final_theme_to_use}")
-            except tk.TclError:
-                 logger.warning(f"Could not apply any fallback ttk themes, using Tk default: {style.theme_use()}")
+            apply_fallback_ttk_theme(ttk.Style(root), initial_theme)
         init_db()
     except Exception as e:
         print(f"CRITICAL: Application startup failed: {e}") 